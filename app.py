@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file, Response, render_template, make_response
+from flask import Flask, request, jsonify, send_file, Response, render_template, make_response, g
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
@@ -6,12 +6,14 @@ import json
 from datetime import datetime
 from pathlib import Path
 import uuid
-import cv2
-import mediapipe as mp
-import numpy as np
 import time
+import threading
 import mimetypes
-import google.generativeai as genai
+import logging
+import random
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
 
 app = Flask(__name__)
 
@@ -38,21 +40,358 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 5000 * 1024 * 1024  # 5GB max
 
 # Gemini API Configuration
-GEMINI_API_KEY = "YOUR_API_KEY"
-genai.configure(api_key=GEMINI_API_KEY)
-gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-
-# In-memory storage
-user_sessions = {}
-
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
-)
-mp_draw = mp.solutions.drawing_utils
+GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', "YOUR_API_KEY")
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+
+# Load the vision and AI models in a background thread at startup instead of
+# on the first gesture/chat request
+WARMUP_SUBSYSTEMS = os.environ.get('WARMUP_SUBSYSTEMS', '0') == '1'
+
+# Logging: hot-path messages (per Range request, per MIME lookup) are logged
+# at DEBUG and only for a sampled fraction of calls
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '0.01'))
+
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger('cinehome')
+
+def log_sampled(level, msg, *args):
+    """Log a hot-path message for roughly LOG_SAMPLE_RATE of calls"""
+    if logger.isEnabledFor(level) and random.random() < LOG_SAMPLE_RATE:
+        logger.log(level, msg, *args)
+
+# Sessions are stored in SQLite so every worker process shares them and they
+# survive restarts
+SESSION_DB_PATH = os.path.join(DATA_FOLDER, 'sessions.sqlite3')
+SESSION_TTL = float(os.environ.get('SESSION_TTL', 30 * 24 * 3600))  # seconds since last activity
+SESSION_SWEEP_INTERVAL = float(os.environ.get('SESSION_SWEEP_INTERVAL', 600))
+SESSION_TOUCH_INTERVAL = 60  # only persist last_active this often
+SESSION_CACHE_SIZE = 4096
+
+# Library counters shared by all worker processes
+LIBRARY_DB_PATH = os.path.join(DATA_FOLDER, 'library.sqlite3')
+
+# ==================== Metrics ====================
+# Metrics are kept in process memory. Every sample carries a `worker` label
+# (the process id) so that, with several worker processes, each worker's
+# series stays distinct instead of appearing as counter resets; each worker
+# must be scraped and the series summed in Prometheus.
+# Latency buckets in seconds, shared by every histogram
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(labels):
+    labels = (('worker', os.getpid()),) + tuple(labels)
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+class Counter:
+    """Monotonic counter with optional labels, rendered in Prometheus text format"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(key)} {value}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series['buckets']):
+                    lines.append(f'{self.name}_bucket{_format_labels(key + (("le", bound),))} {count}')
+                lines.append(f'{self.name}_bucket{_format_labels(key + (("le", "+Inf"),))} {series["count"]}')
+                lines.append(f'{self.name}_sum{_format_labels(key)} {series["sum"]}')
+                lines.append(f'{self.name}_count{_format_labels(key)} {series["count"]}')
+        return lines
+
+request_latency = Histogram('cinehome_request_duration_seconds',
+                            'Request latency until the response body is fully sent, by route, method and status')
+bytes_streamed = Counter('cinehome_bytes_streamed_total',
+                         'Video bytes written to clients')
+gesture_latency = Histogram('cinehome_gesture_duration_seconds',
+                            'Gesture frame decode and inference time by stage')
+chat_upstream_latency = Histogram('cinehome_chat_upstream_duration_seconds',
+                                  'Gemini generate_content latency by outcome')
+storage_latency = Histogram('cinehome_storage_duration_seconds',
+                            'User data load/save time by operation')
+
+METRICS = [request_latency, bytes_streamed, gesture_latency, chat_upstream_latency, storage_latency]
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = getattr(g, 'request_start', None)
+    if start is not None:
+        # Streamed bodies are generated after this hook returns, so observe
+        # once the server has finished sending and closes the response
+        labels = {
+            'route': request.url_rule.rule if request.url_rule else 'unmatched',
+            'method': request.method,
+            'status': response.status_code
+        }
+        response.call_on_close(lambda: request_latency.observe(time.perf_counter() - start, **labels))
+    return response
+
+# ==================== Sessions ====================
+class Session:
+    """A registered user session; timestamps are epoch seconds"""
+    __slots__ = ('user_id', 'created_at', 'last_active')
+
+    def __init__(self, user_id, created_at, last_active):
+        self.user_id = user_id
+        self.created_at = created_at
+        self.last_active = last_active
+
+    def is_expired(self, ttl, now=None):
+        return (now or time.time()) - self.last_active > ttl
+
+class SessionStore:
+    """SQLite-backed session registry with TTL expiry.
+
+    A bounded LRU cache of recently seen sessions avoids a database read on
+    most checks, and last_active is only written back every
+    SESSION_TOUCH_INTERVAL seconds.
+
+    The connection and sweeper thread are created lazily in each process,
+    since neither may be carried across fork() by a pre-forking server.
+    """
+
+    def __init__(self, path, ttl=SESSION_TTL, cache_size=SESSION_CACHE_SIZE,
+                 sweep_interval=SESSION_SWEEP_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.sweep_interval = sweep_interval
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._db_lock = None
+        self._conn = None
+        self._pid = None
+        self._sweeper = None
+
+    def _open(self):
+        """Open this process's connection and start its sweeper"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._init_lock:
+            if self._pid == pid:
+                return
+            # Locks and threads inherited from a parent process are unusable
+            self._lock = threading.Lock()
+            self._db_lock = threading.Lock()
+            self._sweeper = None
+            # One connection per process, shared by request threads
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            with conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS sessions ('
+                    'user_id TEXT PRIMARY KEY, created_at REAL NOT NULL, last_active REAL NOT NULL)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS sessions_last_active ON sessions (last_active)')
+            self._conn = conn
+            self._pid = pid
+            if self.sweep_interval:
+                self.start_sweeper(self.sweep_interval)
+
+    @contextmanager
+    def _connect(self):
+        """Serialise access to the shared connection, committing on success"""
+        self._open()
+        with self._db_lock, self._conn:
+            yield self._conn
+
+    def _cache_put(self, session):
+        with self._lock:
+            self._cache[session.user_id] = session
+            self._cache.move_to_end(session.user_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_pop(self, user_id):
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+    def create(self, user_id):
+        now = time.time()
+        session = Session(user_id, now, now)
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)',
+                         (user_id, session.created_at, session.last_active))
+        self._cache_put(session)
+        return session
+
+    def _load(self, user_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT created_at, last_active FROM sessions WHERE user_id = ?', (user_id,)
+            ).fetchone()
+        return Session(user_id, *row) if row else None
+
+    def get(self, user_id):
+        """Return the live session for user_id, or None if unknown or expired"""
+        self._open()
+        now = time.time()
+        with self._lock:
+            session = self._cache.get(user_id)
+        # Another worker may have refreshed the session, so confirm against
+        # the database before treating a cached entry as expired
+        if session is None or session.is_expired(self.ttl, now):
+            session = self._load(user_id)
+            if session is None or session.is_expired(self.ttl, now):
+                self._cache_pop(user_id)
+                return None
+        self._cache_put(session)
+        return session
+
+    def touch(self, session):
+        now = time.time()
+        if now - session.last_active < SESSION_TOUCH_INTERVAL:
+            return
+        session.last_active = now
+        with self._connect() as conn:
+            conn.execute('UPDATE sessions SET last_active = ? WHERE user_id = ?', (now, session.user_id))
+
+    def sweep(self):
+        """Delete expired sessions and return how many were removed"""
+        cutoff = time.time() - self.ttl
+        with self._connect() as conn:
+            removed = conn.execute('DELETE FROM sessions WHERE last_active < ?', (cutoff,)).rowcount
+        with self._lock:
+            for user_id in [uid for uid, s in self._cache.items() if s.last_active < cutoff]:
+                del self._cache[user_id]
+        return removed
+
+    def start_sweeper(self, interval=SESSION_SWEEP_INTERVAL):
+        """Run sweep() every `interval` seconds in a daemon thread"""
+        if self._sweeper is not None:
+            return self._sweeper
+
+        def _sweep_forever():
+            while True:
+                time.sleep(interval)
+                try:
+                    removed = self.sweep()
+                    if removed:
+                        logger.info("Expired %d sessions", removed)
+                except sqlite3.Error as e:
+                    logger.warning("Session sweep failed: %s", e)
+
+        self._sweeper = threading.Thread(target=_sweep_forever, name='session-sweeper', daemon=True)
+        self._sweeper.start()
+        return self._sweeper
+
+session_store = SessionStore(SESSION_DB_PATH)
+
+# ==================== Lazy Subsystems ====================
+# cv2, mediapipe, numpy and google.generativeai take seconds to import and
+# initialise, so they are loaded on first use. The streaming and catalog
+# endpoints never touch them.
+# One lock per subsystem so a slow vision load never blocks chat requests
+_vision_lock = threading.Lock()
+_gemini_lock = threading.Lock()
+_vision = None
+_gemini_model = None
+
+# Seconds spent importing and initialising each subsystem
+subsystem_load_times = {}
+
+def get_vision():
+    """Return (cv2, numpy, hands), importing them on first use"""
+    global _vision
+    if _vision is None:
+        with _vision_lock:
+            if _vision is None:
+                start = time.perf_counter()
+                import cv2
+                import numpy as np
+                import mediapipe as mp
+                hands = mp.solutions.hands.Hands(
+                    max_num_hands=1,
+                    min_detection_confidence=0.7,
+                    min_tracking_confidence=0.7
+                )
+                _vision = (cv2, np, hands)
+                subsystem_load_times['vision'] = time.perf_counter() - start
+    return _vision
+
+def get_gemini_model():
+    """Return the Gemini model, configuring the client on first use"""
+    global _gemini_model
+    if _gemini_model is None:
+        with _gemini_lock:
+            if _gemini_model is None:
+                start = time.perf_counter()
+                import google.generativeai as genai
+                genai.configure(api_key=GEMINI_API_KEY)
+                _gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                subsystem_load_times['gemini'] = time.perf_counter() - start
+    return _gemini_model
+
+def warmup_subsystems():
+    """Load the vision and AI subsystems in a daemon thread"""
+    def _warmup():
+        for loader in (get_vision, get_gemini_model):
+            try:
+                loader()
+            except Exception as e:
+                logger.warning("Warm-up failed for %s: %s", loader.__name__, e)
+
+    thread = threading.Thread(target=_warmup, name='subsystem-warmup', daemon=True)
+    thread.start()
+    return thread
 
 # Gesture detection settings
 gesture_settings = {
@@ -71,7 +410,7 @@ def get_user_data_path(user_id):
 def load_user_data(user_id):
     path = get_user_data_path(user_id)
     if os.path.exists(path):
-        with open(path, 'r') as f:
+        with storage_latency.time(operation='load'), open(path, 'r') as f:
             return json.load(f)
     return {
         'favorites': [],
@@ -83,9 +422,161 @@ def load_user_data(user_id):
 
 def save_user_data(user_id, data):
     path = get_user_data_path(user_id)
-    with open(path, 'w') as f:
+    with storage_latency.time(operation='save'), open(path, 'w') as f:
         json.dump(data, f, indent=2)
 
+# ==================== Statistics Storage ====================
+# Statistics are maintained incrementally so /stats never scans the upload
+# folder or a user's history. The library video count lives in SQLite so
+# every worker sees the same value, and is adjusted by upload and delete.
+# Per-user counters are kept under the 'stats' key of the user document, so
+# mutations that already load and save the document update them in the same
+# write.
+COMPLETION_THRESHOLD = 95  # percent, matches the frontend's "finished" cut-off
+ACTIVITY_DAYS = 90
+
+def count_library_files():
+    """Count regular files in the upload folder"""
+    folder = app.config['UPLOAD_FOLDER']
+    if not os.path.exists(folder):
+        return 0
+    with os.scandir(folder) as entries:
+        return sum(1 for entry in entries if entry.is_file())
+
+class LibraryStats:
+    """Library video count shared by all worker processes.
+
+    The count is seeded by one scan of the upload folder when the database
+    is created and then adjusted by upload and delete, so reads are O(1).
+    Files added or removed outside the app are not seen until resync().
+    The connection is opened lazily in each process, as for SessionStore.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._init_lock = threading.Lock()
+        self._db_lock = None
+        self._conn = None
+        self._pid = None
+
+    def _open(self):
+        """Open this process's connection; return True if this call seeded the count"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return False
+        with self._init_lock:
+            if self._pid == pid:
+                return False
+            self._db_lock = threading.Lock()
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            with conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS library_stats ('
+                    'id INTEGER PRIMARY KEY CHECK (id = 1), total_videos INTEGER NOT NULL)'
+                )
+                seeded = False
+                if conn.execute('SELECT 1 FROM library_stats').fetchone() is None:
+                    seeded = conn.execute('INSERT OR IGNORE INTO library_stats VALUES (1, ?)',
+                                          (count_library_files(),)).rowcount == 1
+            self._conn = conn
+            self._pid = pid
+            return seeded
+
+    def total_videos(self):
+        self._open()
+        with self._db_lock, self._conn as conn:
+            return conn.execute('SELECT total_videos FROM library_stats').fetchone()[0]
+
+    def adjust(self, delta):
+        """Apply an upload (+1) or delete (-1) that has already hit the disk"""
+        if self._open():
+            return  # the seeding scan already saw this change
+        with self._db_lock, self._conn as conn:
+            conn.execute('UPDATE library_stats SET total_videos = MAX(0, total_videos + ?)', (delta,))
+
+    def resync(self):
+        """Recount the upload folder, e.g. after files were changed by hand"""
+        self._open()
+        count = count_library_files()
+        with self._db_lock, self._conn as conn:
+            conn.execute('UPDATE library_stats SET total_videos = ?', (count,))
+        return count
+
+library_stats = LibraryStats(LIBRARY_DB_PATH)
+
+def compute_user_stats(user_data, previous=None):
+    """Rebuild collection counters from a user document.
+
+    Watch-time aggregates cannot be derived from the document, so they are
+    carried over from `previous` when given.
+    """
+    progress = user_data.get('watchProgress', {})
+    previous = previous or {}
+    return {
+        'totalWatched': len(progress),
+        'totalCompleted': sum(1 for p in progress.values() if is_completed(p)),
+        'totalFavorites': len(user_data.get('favorites', [])),
+        'watchlistSize': len(user_data.get('watchlist', [])),
+        'totalSecondsWatched': previous.get('totalSecondsWatched', 0.0),
+        'dailyActivity': previous.get('dailyActivity', {}),
+        'lastPositions': previous.get('lastPositions', {})
+    }
+
+def get_user_stats(user_data):
+    """Return the stats stored in a user document, building them if absent.
+
+    Documents created before incremental stats get their counters computed
+    here; they are persisted with the document's next save.
+    """
+    if 'stats' not in user_data:
+        user_data['stats'] = compute_user_stats(user_data)
+    return user_data['stats']
+
+def public_user_data(user_data):
+    """User document without server-side bookkeeping; stats are served by /stats"""
+    return {key: value for key, value in user_data.items() if key != 'stats'}
+
+def sync_collection_stats(user_data):
+    """Refresh favorites/watchlist counters after a list mutation"""
+    stats = get_user_stats(user_data)
+    stats['totalFavorites'] = len(user_data['favorites'])
+    stats['watchlistSize'] = len(user_data['watchlist'])
+
+def is_completed(progress):
+    return isinstance(progress, (int, float)) and progress >= COMPLETION_THRESHOLD
+
+def record_watch_progress(stats, video_id, old_progress, new_progress, first_view,
+                          position=None, duration=None):
+    """Apply a single progress update to a user's stats in place"""
+    if first_view:
+        stats['totalWatched'] += 1
+    stats['totalCompleted'] += int(is_completed(new_progress)) - int(is_completed(old_progress))
+
+    if not isinstance(position, (int, float)) or not isinstance(duration, (int, float)) or duration <= 0:
+        return
+
+    # Count forward playback since the previous report; seeks ahead of
+    # wall-clock time and rewinds are not counted as watch time.
+    now = time.time()
+    watched = 0.0
+    last = stats['lastPositions'].get(video_id)
+    if last:
+        last_position, last_time = last
+        delta = position - last_position
+        if 0 < delta <= (now - last_time) + 1:
+            watched = delta
+    stats['lastPositions'][video_id] = [position, now]
+
+    if watched:
+        stats['totalSecondsWatched'] += watched
+        day = datetime.now().date().isoformat()
+        activity = stats['dailyActivity']
+        activity[day] = round(activity.get(day, 0.0) + watched, 2)
+        if len(activity) > ACTIVITY_DAYS:
+            for old_day in sorted(activity)[:-ACTIVITY_DAYS]:
+                del activity[old_day]
+
 # FIXED: Enhanced MIME type detection with proper video formats
 def get_video_mimetype(filename):
     """Get proper MIME type for video file"""
@@ -101,7 +592,7 @@ def get_video_mimetype(filename):
         'm4v': 'video/x-m4v'
     }
     mime = mime_types.get(ext, 'video/mp4')
-    print(f"File: {filename}, Extension: {ext}, MIME: {mime}")
+    log_sampled(logging.DEBUG, "File: %s, Extension: %s, MIME: %s", filename, ext, mime)
     return mime
 
 # ==================== Gesture Recognition Model ====================
@@ -157,8 +648,10 @@ class GestureDetector:
     
     def process_frame(self, frame):
         """Process a frame and detect gestures"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb_frame)
+        cv2, _, hands = get_vision()
+        with gesture_latency.time(stage='inference'):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = hands.process(rgb_frame)
         
         detected_gesture = None
         landmark_data = None
@@ -180,28 +673,31 @@ class GestureDetector:
 
 gesture_detector = GestureDetector()
 
+if WARMUP_SUBSYSTEMS:
+    warmup_subsystems()
+
 # ==================== Authentication ====================
 @app.route('/api/auth/register', methods=['POST'])
 def register():
     data = request.json or {}
     user_id = str(uuid.uuid4())
-    user_sessions[user_id] = {
-        'created_at': datetime.now().isoformat(),
-        'last_active': datetime.now().isoformat()
-    }
-    save_user_data(user_id, {
+    session_store.create(user_id)
+    new_user_data = {
         'favorites': [],
         'watchlist': [],
         'recentVideos': [],
         'watchProgress': {},
         'chatHistory': []
-    })
+    }
+    new_user_data['stats'] = compute_user_stats(new_user_data)
+    save_user_data(user_id, new_user_data)
     return jsonify({'user_id': user_id, 'status': 'success'}), 201
 
 @app.route('/api/auth/session/<user_id>', methods=['GET'])
 def check_session(user_id):
-    if user_id in user_sessions:
-        user_sessions[user_id]['last_active'] = datetime.now().isoformat()
+    session = session_store.get(user_id)
+    if session is not None:
+        session_store.touch(session)
         return jsonify({'valid': True}), 200
     return jsonify({'valid': False}), 401
 
@@ -231,8 +727,15 @@ def chat_message():
         full_prompt = f"{context}\n\nUser: {message}\n\nAssistant:"
         
         # Generate response using Gemini
-        response = gemini_model.generate_content(full_prompt)
-        ai_response = response.text
+        model = get_gemini_model()
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(full_prompt)
+            ai_response = response.text
+        except Exception:
+            chat_upstream_latency.observe(time.perf_counter() - start, outcome='error')
+            raise
+        chat_upstream_latency.observe(time.perf_counter() - start, outcome='success')
         
         # Save to chat history if user_id provided
         if user_id:
@@ -258,7 +761,7 @@ def chat_message():
         }), 200
         
     except Exception as e:
-        print(f"Chat error: {str(e)}")
+        logger.error("Chat error: %s", e)
         return jsonify({
             'status': 'error',
             'message': 'Sorry, I encountered an error. Please try again.',
@@ -288,9 +791,11 @@ def detect_gesture():
         if 'frame' not in request.files:
             return jsonify({'error': 'No frame provided'}), 400
         
+        cv2, np, _ = get_vision()
         file = request.files['frame']
-        file_data = np.frombuffer(file.read(), np.uint8)
-        frame = cv2.imdecode(file_data, cv2.IMREAD_COLOR)
+        with gesture_latency.time(stage='decode'):
+            file_data = np.frombuffer(file.read(), np.uint8)
+            frame = cv2.imdecode(file_data, cv2.IMREAD_COLOR)
         
         if frame is None:
             return jsonify({'error': 'Invalid frame'}), 400
@@ -420,11 +925,13 @@ def upload_videos():
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], new_filename)
             
             file.save(filepath)
+            library_stats.adjust(1)
+            size = os.path.getsize(filepath)
             uploaded_files.append({
                 'id': video_id,
                 'name': filename,
                 'filename': new_filename,
-                'size': os.path.getsize(filepath),
+                'size': size,
                 'uploaded_at': datetime.now().isoformat()
             })
 
@@ -471,23 +978,22 @@ def stream_video(video_id):
     video_path = None
     video_filename = None
     
-    print(f"Looking for video ID: {video_id}")
+    log_sampled(logging.DEBUG, "Looking for video ID: %s", video_id)
     
     if os.path.exists(app.config['UPLOAD_FOLDER']):
         for filename in os.listdir(app.config['UPLOAD_FOLDER']):
             if filename.startswith(video_id):
                 video_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
                 video_filename = filename
-                print(f"Found video: {video_filename} at {video_path}")
+                log_sampled(logging.DEBUG, "Found video: %s at %s", video_filename, video_path)
                 break
     
     if not video_path or not os.path.exists(video_path):
-        print(f"Video not found for ID: {video_id}")
+        logger.info("Video not found for ID: %s", video_id)
         return jsonify({'error': 'Video not found'}), 404
     
     # Get file size
     file_size = os.path.getsize(video_path)
-    print(f"Video size: {file_size} bytes")
     
     # Get MIME type
     mime_type = get_video_mimetype(video_filename)
@@ -504,18 +1010,17 @@ def stream_video(video_id):
     
     # Get range from request headers
     range_header = request.headers.get('Range', None)
-    print(f"Range header: {range_header}")
+    log_sampled(logging.DEBUG, "Range header: %s (video size %d bytes)", range_header, file_size)
     
     if not range_header:
         # No range requested, send entire file (for small files or initial request)
-        print("No range header, sending entire file")
-        
         def generate():
             with open(video_path, 'rb') as f:
                 while True:
                     chunk = f.read(1024 * 1024)  # 1MB chunks
                     if not chunk:
                         break
+                    bytes_streamed.inc(len(chunk), status=200)
                     yield chunk
         
         response = Response(generate(), 
@@ -540,19 +1045,19 @@ def stream_video(video_id):
         if range_match[1]:
             byte_end = min(int(range_match[1]), file_size - 1)
     except Exception as e:
-        print(f"Error parsing range header: {e}")
+        logger.warning("Error parsing range header %r: %s", range_header, e)
         return jsonify({'error': 'Invalid range header'}), 416
     
     # Ensure valid range
     if byte_start > byte_end or byte_start < 0 or byte_end >= file_size:
-        print(f"Invalid range: {byte_start}-{byte_end}/{file_size}")
+        logger.info("Invalid range: %d-%d/%d", byte_start, byte_end, file_size)
         response = make_response('Range Not Satisfiable', 416)
         response.headers['Content-Range'] = f'bytes */{file_size}'
         response.headers['Access-Control-Allow-Origin'] = '*'
         return response
     
     length = byte_end - byte_start + 1
-    print(f"Serving range: {byte_start}-{byte_end}/{file_size} ({length} bytes)")
+    log_sampled(logging.DEBUG, "Serving range: %d-%d/%d (%d bytes)", byte_start, byte_end, file_size, length)
     
     # Read and return the requested range
     def generate():
@@ -565,6 +1070,7 @@ def stream_video(video_id):
                 if not chunk:
                     break
                 remaining -= len(chunk)
+                bytes_streamed.inc(len(chunk), status=206)
                 yield chunk
     
     response = Response(generate(),
@@ -592,6 +1098,7 @@ def delete_video(video_id):
             if filename.startswith(video_id):
                 filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
                 os.remove(filepath)
+                library_stats.adjust(-1)
                 return jsonify({'status': 'success', 'deleted': filename}), 200
     
     return jsonify({'error': 'Video not found'}), 404
@@ -612,6 +1119,7 @@ def manage_favorites(user_id):
         video_id = data.get('video_id')
         if video_id not in user_data['favorites']:
             user_data['favorites'].append(video_id)
+            sync_collection_stats(user_data)
             save_user_data(user_id, user_data)
         return jsonify({'status': 'added', 'favorites': user_data['favorites']}), 201
     
@@ -620,6 +1128,7 @@ def manage_favorites(user_id):
         video_id = data.get('video_id')
         if video_id in user_data['favorites']:
             user_data['favorites'].remove(video_id)
+            sync_collection_stats(user_data)
             save_user_data(user_id, user_data)
         return jsonify({'status': 'removed', 'favorites': user_data['favorites']}), 200
 
@@ -638,6 +1147,7 @@ def manage_watchlist(user_id):
         video_id = data.get('video_id')
         if video_id not in user_data['watchlist']:
             user_data['watchlist'].append(video_id)
+            sync_collection_stats(user_data)
             save_user_data(user_id, user_data)
         return jsonify({'status': 'added', 'watchlist': user_data['watchlist']}), 201
     
@@ -646,6 +1156,7 @@ def manage_watchlist(user_id):
         video_id = data.get('video_id')
         if video_id in user_data['watchlist']:
             user_data['watchlist'].remove(video_id)
+            sync_collection_stats(user_data)
             save_user_data(user_id, user_data)
         return jsonify({'status': 'removed', 'watchlist': user_data['watchlist']}), 200
 
@@ -683,6 +1194,10 @@ def manage_progress(user_id):
         data = request.json or {}
         video_id = data.get('video_id')
         progress = data.get('progress')
+        stats = get_user_stats(user_data)
+        record_watch_progress(stats, video_id, user_data['watchProgress'].get(video_id), progress,
+                              video_id not in user_data['watchProgress'],
+                              data.get('position'), data.get('duration'))
         user_data['watchProgress'][video_id] = progress
         save_user_data(user_id, user_data)
         return jsonify({'status': 'updated', 'progress': progress}), 201
@@ -694,14 +1209,18 @@ def manage_user_data(user_id):
     
     if request.method == 'GET':
         user_data = load_user_data(user_id)
-        return jsonify(user_data), 200
+        return jsonify(public_user_data(user_data)), 200
     
     elif request.method == 'POST':
         new_data = request.json or {}
         current_data = load_user_data(user_id)
+        previous_stats = get_user_stats(current_data)
         current_data.update(new_data)
+        # Counters are always rebuilt from the merged document, never taken
+        # from the client
+        current_data['stats'] = compute_user_stats(current_data, previous_stats)
         save_user_data(user_id, current_data)
-        return jsonify({'status': 'saved', 'data': current_data}), 201
+        return jsonify({'status': 'saved', 'data': public_user_data(current_data)}), 201
 
 # ==================== Statistics ====================
 @app.route('/api/user/<user_id>/stats', methods=['GET', 'OPTIONS'])
@@ -709,23 +1228,33 @@ def get_stats(user_id):
     if request.method == 'OPTIONS':
         return '', 200
     
-    user_data = load_user_data(user_id)
-    videos = 0
-    if os.path.exists(app.config['UPLOAD_FOLDER']):
-        videos = len([f for f in os.listdir(app.config['UPLOAD_FOLDER']) 
-                     if os.path.isfile(os.path.join(app.config['UPLOAD_FOLDER'], f))])
-    watched = len(user_data['watchProgress'])
+    user_stats = get_user_stats(load_user_data(user_id))
+    videos = library_stats.total_videos()
+    watched = user_stats['totalWatched']
+    completed = user_stats['totalCompleted']
     
     stats = {
         'totalVideos': videos,
         'totalWatched': watched,
-        'totalFavorites': len(user_data['favorites']),
-        'watchlistSize': len(user_data['watchlist']),
-        'percentageWatched': round((watched / videos * 100) if videos > 0 else 0, 2)
+        'totalFavorites': user_stats['totalFavorites'],
+        'watchlistSize': user_stats['watchlistSize'],
+        'percentageWatched': round((watched / videos * 100) if videos > 0 else 0, 2),
+        'totalCompleted': completed,
+        'completionRate': round((completed / watched * 100) if watched > 0 else 0, 2),
+        'totalSecondsWatched': round(user_stats['totalSecondsWatched'], 2),
+        'dailyActivity': user_stats['dailyActivity']
     }
     
     return jsonify(stats), 200
 
+# ==================== Metrics ====================
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose request, streaming, gesture, chat and storage metrics in Prometheus text format"""
+    response = make_response(render_metrics(), 200)
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
 # ==================== Main Route ====================
 @app.route('/')
 def index():
@@ -748,5 +1277,6 @@ if __name__ == '__main__':
     print(f"Data Folder: {os.path.abspath(DATA_FOLDER)}")
     print("Server running on: http://localhost:5000")
     print("CORS enabled for video streaming")
+    print(f"Subsystem warm-up: {'background' if WARMUP_SUBSYSTEMS else 'on first use'}")
     print("=" * 60)
     app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,285 @@
+"""Offline benchmark suite for CineHome+
+
+Covers the hot paths that regress silently:
+  * stream        - Range request throughput under concurrency
+  * progress      - watch progress update throughput (load + save user data)
+  * gesture       - GestureDetector.process_frame frames/sec
+  * catalog       - /api/videos/list and /api/user/<id>/stats latency at
+                    10, 1k and 10k videos
+  * chat          - /api/chat/message overhead (history load + save) with
+                    the Gemini call stubbed out
+
+Everything runs against synthetic video files, generated user documents and
+a stub Gemini model inside a temporary directory. Gesture frames are
+synthetic unless --frames-dir points at recorded sample images.
+
+Usage:
+    python benchmarks/benchmark_suite.py [--only stream,catalog] [--output results.json]
+    python benchmarks/benchmark_suite.py --compare baseline.json --output current.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from fixtures import StubGeminiModel, create_video_file, populate_library, user_document
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = ['stream', 'progress', 'gesture', 'catalog', 'chat']
+CATALOG_SIZES = [10, 1000, 10000]
+
+
+def summarize(samples):
+    """Latency percentiles in milliseconds"""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 3)
+
+    return {
+        'n': len(ordered),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 3),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+
+def fresh_workspace(cinehome):
+    """Empty the upload and data folders the app reads from"""
+    # The session and library databases (and their -wal/-shm files) stay
+    # open in the app
+    databases = tuple(os.path.basename(path) for path in (cinehome.SESSION_DB_PATH, cinehome.LIBRARY_DB_PATH))
+    for folder in (cinehome.app.config['UPLOAD_FOLDER'], cinehome.DATA_FOLDER):
+        for name in os.listdir(folder):
+            if not name.startswith(databases):
+                os.remove(os.path.join(folder, name))
+
+
+def bench_stream(cinehome, args):
+    fresh_workspace(cinehome)
+    size = args.video_mb * 1024 * 1024
+    video_id = create_video_file(cinehome.app.config['UPLOAD_FOLDER'], size)
+    range_size = 1024 * 1024
+
+    def worker(seed):
+        client = cinehome.app.test_client()
+        rng = random.Random(seed)
+        latencies, total = [], 0
+        for _ in range(args.requests):
+            start_byte = rng.randrange(0, max(1, size - range_size))
+            start = time.perf_counter()
+            response = client.get(f'/api/videos/stream/{video_id}',
+                                  headers={'Range': f'bytes={start_byte}-{start_byte + range_size - 1}'})
+            total += len(response.get_data())
+            latencies.append(time.perf_counter() - start)
+        return latencies, total
+
+    results = {}
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - start
+        latencies = [l for lats, _ in outcomes for l in lats]
+        total_bytes = sum(total for _, total in outcomes)
+        results[f'concurrency_{concurrency}'] = {
+            **summarize(latencies),
+            'requests_per_sec': round(len(latencies) / elapsed, 2),
+            'mb_per_sec': round(total_bytes / elapsed / (1024 * 1024), 2),
+        }
+    return results
+
+
+def bench_progress(cinehome, args):
+    fresh_workspace(cinehome)
+    video_ids = populate_library(cinehome.app.config['UPLOAD_FOLDER'], 1000)
+    user_id = 'bench-user'
+    cinehome.save_user_data(user_id, user_document(video_ids))
+    client = cinehome.app.test_client()
+    rng = random.Random(0)
+    duration = 7200.0
+    positions = {}
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.requests * 5):
+        # Simulate playback: each report advances a video by one timeupdate
+        # interval, so the watch-time aggregation path is exercised too
+        video_id = rng.choice(video_ids)
+        position = min(duration, positions.get(video_id, rng.uniform(0, duration)) + 0.25)
+        positions[video_id] = position
+        payload = {'video_id': video_id, 'progress': round(position / duration * 100),
+                   'position': position, 'duration': duration}
+        req_start = time.perf_counter()
+        client.post(f'/api/user/{user_id}/progress', json=payload)
+        latencies.append(time.perf_counter() - req_start)
+    elapsed = time.perf_counter() - start
+    return {**summarize(latencies), 'updates_per_sec': round(len(latencies) / elapsed, 2)}
+
+
+def load_frames(cv2, np, frames_dir, count):
+    """Return (frames, source); synthetic noise frames contain no hand"""
+    if frames_dir:
+        frames = [cv2.imread(os.path.join(frames_dir, name))
+                  for name in sorted(os.listdir(frames_dir))]
+        frames = [frame for frame in frames if frame is not None]
+        if frames:
+            return frames, 'recorded'
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8) for _ in range(count)], 'synthetic'
+
+
+def bench_gesture(cinehome, args):
+    try:
+        cv2, np, _ = cinehome.get_vision()
+    except ImportError as e:
+        return {'skipped': f'vision subsystem unavailable: {e}'}
+
+    frames, source = load_frames(cv2, np, args.frames_dir, 30)
+    detector = cinehome.GestureDetector()
+    detector.process_frame(frames[0])  # exclude graph initialisation
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.requests * 5):
+        frame_start = time.perf_counter()
+        detector.process_frame(frames[i % len(frames)])
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    result = {**summarize(latencies), 'frames_per_sec': round(len(latencies) / elapsed, 2),
+              'frames': source}
+    if source == 'synthetic':
+        result['note'] = 'synthetic frames contain no hand; only the no-hand path is measured (use --frames-dir)'
+    return result
+
+
+def bench_catalog(cinehome, args):
+    results = {}
+    client = cinehome.app.test_client()
+    for count in CATALOG_SIZES:
+        fresh_workspace(cinehome)
+        video_ids = populate_library(cinehome.app.config['UPLOAD_FOLDER'], count)
+        # Files were written directly, not uploaded, so recount the library
+        cinehome.library_stats.resync()
+        user_id = f'bench-user-{count}'
+        cinehome.save_user_data(user_id, user_document(video_ids[:1000]))
+
+        for name, path in (('list', '/api/videos/list'), ('stats', f'/api/user/{user_id}/stats')):
+            client.get(path)  # exclude the one-off user stats rebuild
+            latencies = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                client.get(path)
+                latencies.append(time.perf_counter() - start)
+            results[f'{name}_{count}'] = summarize(latencies)
+    return results
+
+
+def bench_chat(cinehome, args):
+    fresh_workspace(cinehome)
+    user_id = 'bench-user'
+    cinehome.save_user_data(user_id, user_document([]))
+    client = cinehome.app.test_client()
+
+    latencies = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        client.post('/api/chat/message', json={'message': 'Any recommendations?', 'user_id': user_id})
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """Print the relative change of every shared numeric metric"""
+    print(f"\n{'metric':<50}{'baseline':>12}{'current':>12}{'change':>10}")
+    for bench, metrics in current['results'].items():
+        base_metrics = baseline.get('results', {}).get(bench, {})
+        flat = {}
+        for key, value in metrics.items():
+            if isinstance(value, dict):
+                flat.update({f'{key}.{k}': (v, base_metrics.get(key, {}).get(k)) for k, v in value.items()})
+            else:
+                flat[key] = (value, base_metrics.get(key))
+        for key, (value, base) in flat.items():
+            if isinstance(value, (int, float)) and isinstance(base, (int, float)) and base:
+                change = (value - base) / base * 100
+                print(f"{bench + '.' + key:<50}{base:>12}{value:>12}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CineHome+ benchmark suite')
+    parser.add_argument('--only', help='Comma-separated subset of: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--requests', type=int, default=50, help='Requests per worker / sample size')
+    parser.add_argument('--concurrency', type=lambda v: [int(c) for c in v.split(',')],
+                        default=[1, 4, 16], help='Comma-separated stream worker counts')
+    parser.add_argument('--video-mb', type=int, default=64, help='Size of the synthetic stream video')
+    parser.add_argument('--frames-dir', help='Directory of recorded sample frames for the gesture benchmark')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--compare', help='Baseline JSON results to compare against')
+    args = parser.parse_args()
+
+    selected = args.only.split(',') if args.only else BENCHMARKS
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    # Paths are resolved before switching into the temporary workspace
+    cwd = os.getcwd()
+    for option in ('frames_dir', 'output', 'compare'):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.environ['WARMUP_SUBSYSTEMS'] = '0'
+        sys.path.insert(0, REPO_ROOT)
+        import app as cinehome
+        cinehome._gemini_model = StubGeminiModel()
+        logging.getLogger('cinehome').setLevel(logging.WARNING)
+
+        runners = {'stream': bench_stream, 'progress': bench_progress,
+                   'gesture': bench_gesture, 'catalog': bench_catalog, 'chat': bench_chat}
+        results = {}
+        for name in selected:
+            print(f"Running {name}...", flush=True)
+            results[name] = runners[name](cinehome, args)
+        os.chdir(cwd)
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
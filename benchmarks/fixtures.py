@@ -0,0 +1,73 @@
+"""Synthetic data shared by the CineHome+ benchmarks
+
+Everything here is generated locally so the benchmarks run offline.
+"""
+import os
+import random
+import struct
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+
+def blank_png(width=64, height=64):
+    """Build a black RGB PNG without needing cv2 or numpy"""
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    raw = b''.join(b'\x00' + b'\x00' * (width * 3) for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw))
+            + chunk(b'IEND', b''))
+
+
+def create_video_file(folder, size, ext='mp4'):
+    """Write a video-sized file of random bytes and return its id"""
+    video_id = str(uuid.uuid4())
+    with open(os.path.join(folder, f'{video_id}.{ext}'), 'wb') as f:
+        remaining = size
+        block = os.urandom(min(size, 1024 * 1024)) if size else b''
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+    return video_id
+
+
+def populate_library(folder, count, size=1):
+    """Fill the upload folder with `count` small placeholder videos"""
+    return [create_video_file(folder, size) for _ in range(count)]
+
+
+def user_document(video_ids, history_size=50, seed=0):
+    """Generate a user data document in the shape load_user_data returns"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    return {
+        'favorites': rng.sample(video_ids, min(len(video_ids), 20)),
+        'watchlist': rng.sample(video_ids, min(len(video_ids), 20)),
+        'recentVideos': rng.sample(video_ids, min(len(video_ids), 20)),
+        # Progress is a percentage of the video, as sent by the frontend
+        'watchProgress': {vid: rng.randint(0, 100) for vid in video_ids},
+        'chatHistory': [{
+            'timestamp': (now - timedelta(minutes=i)).isoformat(),
+            'user_message': 'Recommend something like this',
+            'ai_response': 'You might enjoy a similar film. ' * 10,
+            'current_video': rng.choice(video_ids) if video_ids else None
+        } for i in range(history_size)]
+    }
+
+
+class StubGeminiModel:
+    """Offline stand-in for genai.GenerativeModel"""
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, reply='Here is a stub recommendation.'):
+        self.reply = reply
+
+    def generate_content(self, prompt):
+        return self._Response(self.reply)
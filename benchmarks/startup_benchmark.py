@@ -0,0 +1,143 @@
+"""Startup-time benchmark for CineHome+
+
+Measures, in a fresh interpreter per subsystem:
+  * how long `import app` takes
+  * the latency of the first request that touches each subsystem
+  * the import/initialisation time recorded by the lazy loaders
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 3] [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from fixtures import StubGeminiModel, blank_png
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsystem name -> first request issued against a freshly imported app
+SUBSYSTEMS = ['catalog', 'streaming', 'gesture', 'chat']
+
+
+def run_child(subsystem):
+    """Import the app, issue one request and print timings as JSON"""
+    import io
+    import time
+
+    sys.path.insert(0, REPO_ROOT)
+    start = time.perf_counter()
+    import app as cinehome
+    import_seconds = time.perf_counter() - start
+
+    client = cinehome.app.test_client()
+    video_id = 'startup-bench'
+    with open(os.path.join(cinehome.UPLOAD_FOLDER, f'{video_id}.mp4'), 'wb') as f:
+        f.write(os.urandom(256 * 1024))
+
+    start = time.perf_counter()
+    try:
+        # Vision and chat load their subsystem inside the timed region, which
+        # is exactly what their first request would do
+        if subsystem == 'gesture':
+            cinehome.get_vision()
+        elif subsystem == 'chat':
+            cinehome.get_gemini_model()
+    except ImportError as e:
+        print(json.dumps({'skipped': f'{subsystem} subsystem unavailable: {e}'}))
+        return
+
+    if subsystem == 'catalog':
+        response = client.get('/api/videos/list')
+    elif subsystem == 'streaming':
+        response = client.get(f'/api/videos/stream/{video_id}',
+                              headers={'Range': 'bytes=0-65535'})
+        response.get_data()
+    elif subsystem == 'gesture':
+        response = client.post('/api/gesture/detect',
+                               data={'frame': (io.BytesIO(blank_png()), 'frame.png')},
+                               content_type='multipart/form-data')
+    elif subsystem == 'chat':
+        # Swap in the stub so the request stays offline and does not time
+        # an upstream call
+        cinehome._gemini_model = StubGeminiModel()
+        response = client.post('/api/chat/message', json={'message': 'hello'})
+    else:
+        raise ValueError(f'Unknown subsystem: {subsystem}')
+    first_request_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'import_seconds': import_seconds,
+        'first_request_seconds': first_request_seconds,
+        'status_code': response.status_code,
+        'subsystem_load_times': cinehome.subsystem_load_times,
+    }))
+
+
+def measure(subsystem, runs):
+    """Run the child benchmark `runs` times in fresh processes"""
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(os.environ, WARMUP_SUBSYSTEMS='0')
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', subsystem],
+                cwd=workdir, env=env, capture_output=True, text=True
+            )
+        # A failing subsystem is recorded rather than aborting the whole run
+        if child.returncode != 0:
+            stderr = child.stderr.strip().splitlines()
+            return {'error': stderr[-1] if stderr else f'exit status {child.returncode}'}
+        sample = json.loads(child.stdout.strip().splitlines()[-1])
+        if 'skipped' in sample:
+            return sample
+        samples.append(sample)
+
+    def median_ms(values):
+        return round(statistics.median(values) * 1000, 2) if values else None
+
+    load_times = [s['subsystem_load_times'] for s in samples]
+    return {
+        'runs': runs,
+        'import_ms': median_ms([s['import_seconds'] for s in samples]),
+        'first_request_ms': median_ms([s['first_request_seconds'] for s in samples]),
+        'status_codes': sorted({s['status_code'] for s in samples}),
+        'load_ms': {
+            name: median_ms([t[name] for t in load_times if name in t])
+            for name in sorted({name for t in load_times for name in t})
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CineHome+ startup benchmark')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--child', choices=SUBSYSTEMS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = {name: measure(name, args.runs) for name in SUBSYSTEMS}
+
+    print(f"{'subsystem':<12}{'import ms':>12}{'first req ms':>15}{'load ms':>30}")
+    for name, result in results.items():
+        if 'skipped' in result or 'error' in result:
+            print(f"{name:<12}{result.get('skipped') or result.get('error')}")
+            continue
+        load = ', '.join(f'{k}={v}' for k, v in result['load_ms'].items()) or '-'
+        print(f"{name:<12}{result['import_ms']:>12}{result['first_request_ms']:>15}{load:>30}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
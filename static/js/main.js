@@ -127,8 +127,8 @@ class CineHomeAPI {
         return data.watchProgress; 
     }
     
-    async updateWatchProgress(videoId, progress) { 
-        return this.post(`/api/user/${this.userId}/progress`, { video_id: videoId, progress }); 
+    async updateWatchProgress(videoId, progress, position, duration) { 
+        return this.post(`/api/user/${this.userId}/progress`, { video_id: videoId, progress, position, duration }); 
     }
 
     async getAllUserData() { 
@@ -525,7 +525,8 @@ async function updateWatchProgress() {
     if (!isNaN(progress)) {
         watchProgress[video.id] = Math.round(progress);
         try {
-            await api.updateWatchProgress(video.id, Math.round(progress));
+            await api.updateWatchProgress(video.id, Math.round(progress),
+                elements.videoPlayer.currentTime, elements.videoPlayer.duration);
         } catch (error) {
             console.error('Error updating progress:', error);
         }